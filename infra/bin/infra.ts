@@ -16,6 +16,8 @@ const app = new cdk.App();
 const appName = app.node.tryGetContext('appName') || 'phaserai';
 const environment = app.node.tryGetContext('environment') || 'dev';
 const notificationEmail = app.node.tryGetContext('notificationEmail') || '';
+// Unset leaves the stack's default in place
+const wordsProvisionedConcurrency = app.node.tryGetContext('wordsProvisionedConcurrency');
 
 // Common environment configuration
 const env = {
@@ -66,6 +68,7 @@ const migrationStack = new MigrationStack(app, `${appName}-migration-${environme
   vpc: productionDatabaseStack.vpc,
   databaseSecretArn: productionDatabaseStack.databaseSecret.secretArn,
   databaseEndpoint: productionDatabaseStack.database.instanceEndpoint.hostname,
+  databaseProxyEndpoint: productionDatabaseStack.databaseProxy.endpoint,
   lambdaSecurityGroup: productionDatabaseStack.lambdaSecurityGroup,
   env,
 });
@@ -85,7 +88,9 @@ const productionApiStack = new ProductionApiStack(app, `${appName}-prod-api-${en
   vpc: productionDatabaseStack.vpc,
   databaseSecretArn: productionDatabaseStack.databaseSecret.secretArn,
   databaseEndpoint: productionDatabaseStack.database.instanceEndpoint.hostname,
+  databaseProxyEndpoint: productionDatabaseStack.databaseProxy.endpoint,
   lambdaSecurityGroup: productionDatabaseStack.lambdaSecurityGroup,
+  wordsProvisionedConcurrency: wordsProvisionedConcurrency === undefined ? undefined : Number(wordsProvisionedConcurrency),
   env,
 });
 
@@ -102,12 +102,12 @@ CREATE TABLE IF NOT EXISTS app_8b514_phonological_violations (
 -- ============================================================================
 
 -- Core table indexes
-CREATE INDEX IF NOT EXISTS idx_languages_user_id ON app_8b514_languages(user_id);
+CREATE INDEX IF NOT EXISTS idx_languages_user_created ON app_8b514_languages(user_id, created_at DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_languages_status ON app_8b514_languages(status);
 CREATE INDEX IF NOT EXISTS idx_languages_user_status ON app_8b514_languages(user_id, status);
-CREATE INDEX IF NOT EXISTS idx_words_language_id ON app_8b514_words(language_id);
+CREATE INDEX IF NOT EXISTS idx_words_language_created ON app_8b514_words(language_id, created_at DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_words_is_root ON app_8b514_words(is_root);
-CREATE INDEX IF NOT EXISTS idx_translations_word_id ON app_8b514_translations(word_id);
+CREATE INDEX IF NOT EXISTS idx_translations_word_created ON app_8b514_translations(word_id, created_at);
 CREATE INDEX IF NOT EXISTS idx_translations_language_code ON app_8b514_translations(language_code);
 CREATE INDEX IF NOT EXISTS idx_subscriptions_user_id ON app_8b514_subscriptions(user_id);
 
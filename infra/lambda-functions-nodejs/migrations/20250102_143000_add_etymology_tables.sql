@@ -0,0 +1,25 @@
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS app_8b514_word_etymology (
+    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+    word_id UUID REFERENCES app_8b514_words(id) ON DELETE CASCADE NOT NULL,
+    parent_word_id UUID REFERENCES app_8b514_words(id) ON DELETE SET NULL,
+    derivation_type VARCHAR(50),
+    derivation_notes TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS app_8b514_phonological_violations (
+    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+    word_id UUID REFERENCES app_8b514_words(id) ON DELETE CASCADE NOT NULL,
+    violation_type VARCHAR(100) NOT NULL,
+    description TEXT NOT NULL,
+    severity VARCHAR(20) DEFAULT 'warning',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_word_etymology_word ON app_8b514_word_etymology(word_id);
+CREATE INDEX IF NOT EXISTS idx_word_etymology_parent ON app_8b514_word_etymology(parent_word_id);
+CREATE INDEX IF NOT EXISTS idx_phonological_violations_word ON app_8b514_phonological_violations(word_id);
+
+COMMIT;
@@ -0,0 +1,15 @@
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS app_8b514_user_preferences (
+    user_id TEXT PRIMARY KEY REFERENCES app_8b514_users(user_id) ON DELETE CASCADE,
+    theme VARCHAR(20) DEFAULT 'light',
+    language VARCHAR(10) DEFAULT 'en',
+    notifications_enabled BOOLEAN DEFAULT true,
+    preferences JSONB DEFAULT '{}'::jsonb,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_user_preferences_user_id ON app_8b514_user_preferences(user_id);
+
+COMMIT;
@@ -0,0 +1,6 @@
+BEGIN;
+
+ALTER TABLE app_8b514_languages 
+ADD COLUMN IF NOT EXISTS syllable_rules JSONB DEFAULT '{}'::jsonb;
+
+COMMIT;
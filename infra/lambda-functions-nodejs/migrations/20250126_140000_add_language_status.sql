@@ -0,0 +1,19 @@
+BEGIN;
+
+-- Add status column with default value 'active'
+ALTER TABLE app_8b514_languages 
+ADD COLUMN IF NOT EXISTS status VARCHAR(20) DEFAULT 'active' 
+CHECK (status IN ('active', 'in_progress', 'inactive', 'dead'));
+
+-- Update existing languages to have 'active' status if NULL
+UPDATE app_8b514_languages 
+SET status = 'active' 
+WHERE status IS NULL;
+
+-- Add index for status column for efficient filtering
+CREATE INDEX IF NOT EXISTS idx_languages_status ON app_8b514_languages(status);
+
+-- Composite index for user_id and status for dashboard queries
+CREATE INDEX IF NOT EXISTS idx_languages_user_status ON app_8b514_languages(user_id, status);
+
+COMMIT;
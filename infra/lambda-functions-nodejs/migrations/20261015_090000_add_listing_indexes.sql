@@ -0,0 +1,16 @@
+BEGIN;
+
+-- Word lists filter by language and order newest first (created_at, id as keyset tiebreaker);
+-- the composite index serves both without a sort and covers language_id-only lookups
+CREATE INDEX IF NOT EXISTS idx_words_language_created ON app_8b514_words(language_id, created_at DESC, id DESC);
+DROP INDEX IF EXISTS idx_words_language_id;
+
+-- Translations are always read per word in created_at order
+CREATE INDEX IF NOT EXISTS idx_translations_word_created ON app_8b514_translations(word_id, created_at);
+DROP INDEX IF EXISTS idx_translations_word_id;
+
+-- Language lists filter by user and order newest first; user_id-only lookups are served by this index too
+CREATE INDEX IF NOT EXISTS idx_languages_user_created ON app_8b514_languages(user_id, created_at DESC, id DESC);
+DROP INDEX IF EXISTS idx_languages_user_id;
+
+COMMIT;
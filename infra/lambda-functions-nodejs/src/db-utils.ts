@@ -1,7 +1,8 @@
-import { Pool, PoolClient, QueryResult } from 'pg';
+import { Pool, PoolClient, QueryConfig, QueryResult } from 'pg';
 import { SecretsManagerClient, GetSecretValueCommand } from '@aws-sdk/client-secrets-manager';
+import { APIGatewayProxyEvent, APIGatewayProxyResult } from 'aws-lambda';
 
-interface DatabaseCredentials {
+export interface DatabaseCredentials {
   host: string;
   port: number;
   dbname: string;
@@ -15,85 +16,446 @@ interface LambdaResponse {
   body: string;
 }
 
+// Bound each GetSecretValue call (default 3s) so a socket left dead by a container freeze fails fast instead
+// of holding the invocation until the Lambda or API Gateway timeout
+const SECRET_REQUEST_TIMEOUT_MS = Number(process.env.SECRET_REQUEST_TIMEOUT_MS || 3000);
+
+// Created once per container and reused across warm invocations
+const secretsClient = new SecretsManagerClient({
+  requestHandler: { connectionTimeout: 1000, requestTimeout: SECRET_REQUEST_TIMEOUT_MS },
+});
+
+// Cached credentials are re-read after this interval (default 1h) so secret rotation is picked up without a redeploy
+const SECRET_REFRESH_INTERVAL_MS = Number(process.env.SECRET_REFRESH_INTERVAL_MS || 3600000);
+
+// Connections held per container. A container serves one invocation at a time, so 1 is enough unless a
+// handler runs queries in parallel; keep (concurrent containers * DB_POOL_MAX) below the RDS max_connections
+const DB_POOL_MAX = Number(process.env.DB_POOL_MAX || 1);
+
+// A named statement is session state that ties the client to one backend, which defeats RDS Proxy's
+// transaction-level multiplexing; behind the proxy statements go out unnamed unless DB_NAMED_STATEMENTS=true
+const USE_NAMED_STATEMENTS = process.env.DB_NAMED_STATEMENTS
+  ? process.env.DB_NAMED_STATEMENTS === 'true'
+  : !process.env.DB_PROXY_ENDPOINT;
+
+let credentials: DatabaseCredentials | null = null;
+let credentialsFetchedAt = 0;
+let credentialsRequest: Promise<DatabaseCredentials> | null = null;
+let credentialsPrefetch: Promise<DatabaseCredentials | null> | null = null;
+let credentialsPrefetchStartedAt = 0;
 let pool: Pool | null = null;
 
+// Connection-level failures (dropped sockets, server restarts or failovers)
+// after which the pool should be rebuilt rather than the error surfaced
+const CONNECTION_ERROR_CODES = new Set(['ECONNRESET', 'ECONNREFUSED', 'EPIPE', 'ETIMEDOUT', '57P01', '57P02', '57P03']);
+
+// invalid_password: the secret was rotated since the credentials were cached
+const AUTH_ERROR_CODE = '28P01';
+
+function isConnectionError(error: any): boolean {
+  return CONNECTION_ERROR_CODES.has(error?.code) || error?.code === AUTH_ERROR_CODE
+    || String(error?.code || '').startsWith('08')
+    || /Connection terminated/i.test(error?.message || '');
+}
+
+export async function getDatabaseCredentials(): Promise<DatabaseCredentials> {
+  if (credentials && Date.now() - credentialsFetchedAt < SECRET_REFRESH_INTERVAL_MS) {
+    return credentials;
+  }
+
+  // Wait for the init-time prefetch only while it could still be live: one older than the request timeout was
+  // started before a freeze and may be stuck on a dead socket. A failed prefetch falls through to a fresh fetch
+  if (credentialsPrefetch && Date.now() - credentialsPrefetchStartedAt < SECRET_REQUEST_TIMEOUT_MS) {
+    const prefetched = await credentialsPrefetch;
+    if (prefetched) {
+      return prefetched;
+    }
+  }
+
+  // Concurrent callers within an invocation share one GetSecretValue call
+  if (!credentialsRequest) {
+    credentialsRequest = fetchDatabaseCredentials().finally(() => {
+      credentialsRequest = null;
+    });
+  }
+
+  return credentialsRequest;
+}
+
+async function fetchDatabaseCredentials(): Promise<DatabaseCredentials> {
+  const secretArn = process.env.SECRET_ARN;
+  if (!secretArn) {
+    throw new Error('SECRET_ARN environment variable not set');
+  }
+
+  const command = new GetSecretValueCommand({ SecretId: secretArn });
+  const response = await secretsClient.send(command);
+
+  credentials = JSON.parse(response.SecretString!) as DatabaseCredentials;
+  credentialsFetchedAt = Date.now();
+
+  return credentials;
+}
+
+export function invalidateDatabaseCredentials(): void {
+  credentials = null;
+}
+
 export async function getDbConnection(): Promise<Pool> {
   if (pool) {
     return pool;
   }
 
-  const secretsClient = new SecretsManagerClient({});
-  const command = new GetSecretValueCommand({
-    SecretId: process.env.SECRET_ARN!,
-  });
+  const secret = await getDatabaseCredentials();
 
-  const response = await secretsClient.send(command);
-  const secret: DatabaseCredentials = JSON.parse(response.SecretString!);
+  // Another caller may have created the pool while this one waited on credentials
+  if (pool) {
+    return pool;
+  }
 
   pool = new Pool({
-    host: secret.host,
+    // Prefer RDS Proxy so connects reuse the proxy's warm backend connections
+    host: process.env.DB_PROXY_ENDPOINT || secret.host,
     port: secret.port,
     database: secret.dbname,
     user: secret.username,
     password: secret.password,
     ssl: { rejectUnauthorized: false },
-    max: 1, // Lambda connection limit
+    max: DB_POOL_MAX,
     idleTimeoutMillis: 30000,
     connectionTimeoutMillis: 2000,
+    keepAlive: true,
+    keepAliveInitialDelayMillis: 30000,
+  });
+
+  // An idle client dying (e.g. closed server-side while the container was frozen) is emitted on the pool;
+  // unhandled, that 'error' event would crash the process. Drop the pool so the next query reconnects.
+  const current = pool;
+  current.on('error', (error) => {
+    console.error('Idle database connection failed:', error.message);
+    if (pool === current) {
+      void resetDbConnection();
+    }
   });
 
   return pool;
 }
 
+async function resetDbConnection(): Promise<void> {
+  const stale = pool;
+  pool = null;
+
+  if (stale) {
+    await stale.end().catch(() => undefined);
+  }
+}
+
 export async function executeQuery<T extends Record<string, any> = any>(
   query: string,
   params?: any[],
   fetch: boolean = true
 ): Promise<T[]> {
+  const result = await queryWithReconnect<T>({ text: query, values: params });
+
+  if (fetch) {
+    return result.rows;
+  } else {
+    return [{ rowCount: result.rowCount } as unknown as T];
+  }
+}
+
+// Existence check for verify-style lookups: Postgres stops at the first match and returns one boolean
+export async function exists(query: string, params: any[] = []): Promise<boolean> {
+  const result = await queryWithReconnect<{ exists: boolean }>({ text: `SELECT EXISTS (${query})`, values: params });
+  return result.rows[0].exists;
+}
+
+// Runs a named statement: pg parses and plans it once per connection, then reuses the plan on warm invocations.
+// Falls back to an ordinary parameterized query when named statements are disabled (see USE_NAMED_STATEMENTS)
+export async function executePrepared<T extends Record<string, any> = any>(
+  name: string,
+  query: string,
+  params: any[] = []
+): Promise<T[]> {
+  const config: QueryConfig = USE_NAMED_STATEMENTS ? { name, text: query, values: params } : { text: query, values: params };
+  const result = await queryWithReconnect<T>(config);
+  return result.rows;
+}
+
+// Statements that only read; anything else (INSERT, UPDATE, data-modifying CTEs) is not safe to replay
+const READ_ONLY_QUERY = /^\s*SELECT\b/i;
+
+async function queryWithReconnect<T extends Record<string, any>>(config: QueryConfig): Promise<QueryResult<T>> {
+  const attempt = { sent: false };
+
+  try {
+    return await runQuery<T>(config, attempt);
+  } catch (error) {
+    if (!isConnectionError(error)) {
+      throw error;
+    }
+
+    if ((error as any).code === AUTH_ERROR_CODE) {
+      invalidateDatabaseCredentials();
+    }
+    await resetDbConnection();
+
+    // A write that reached the server may have committed before the socket died; replaying it could duplicate rows
+    if (attempt.sent && !READ_ONLY_QUERY.test(config.text)) {
+      throw error;
+    }
+
+    // The reused connection went away between invocations; reconnect once
+    console.warn('Database connection lost, reconnecting:', (error as Error).message);
+    return await runQuery<T>(config, { sent: false });
+  }
+}
+
+async function runQuery<T extends Record<string, any>>(config: QueryConfig, attempt: { sent: boolean }): Promise<QueryResult<T>> {
   const pool = await getDbConnection();
   const client: PoolClient = await pool.connect();
 
   try {
-    const result: QueryResult<T> = await client.query(query, params);
-    
-    if (fetch) {
-      return result.rows;
-    } else {
-      return [{ rowCount: result.rowCount } as unknown as T];
-    }
+    attempt.sent = true;
+    return await client.query<T>(config);
   } finally {
     client.release();
   }
 }
 
+// Shared by every response that doesn't override headers; never mutated
+const DEFAULT_HEADERS: Readonly<Record<string, string>> = Object.freeze({
+  'Content-Type': 'application/json',
+  'Access-Control-Allow-Origin': '*',
+  'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+  'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+});
+
 export function lambdaResponse(
   statusCode: number,
   body: any,
   headers?: Record<string, string>
 ): LambdaResponse {
-  const defaultHeaders = {
-    'Content-Type': 'application/json',
-    'Access-Control-Allow-Origin': '*',
-    'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
-    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
-  };
-
   return {
     statusCode,
-    headers: { ...defaultHeaders, ...headers },
+    headers: headers ? { ...DEFAULT_HEADERS, ...headers } : (DEFAULT_HEADERS as Record<string, string>),
     body: JSON.stringify(body),
   };
 }
 
-export function extractPathParams(event: any): Record<string, string> {
-  return event.pathParameters || {};
+// Constant responses are built once at module load; handlers return the same frozen object on every hit
+export function staticResponse(statusCode: number, body: any): LambdaResponse {
+  return Object.freeze(lambdaResponse(statusCode, body));
+}
+
+export const METHOD_NOT_ALLOWED_RESPONSE = staticResponse(405, { error: 'Method not allowed' });
+
+// First required field that is missing or empty in a parsed request body; non-object bodies miss the first field
+export function findMissingField(body: unknown, requiredFields: readonly string[]): string | undefined {
+  if (!body || typeof body !== 'object') {
+    return requiredFields[0];
+  }
+
+  return requiredFields.find(field => !(body as Record<string, unknown>)[field]);
+}
+
+// Bounded in-memory cache that lives across warm invocations of a container.
+// Entries expire after ttlMs; when full, the least recently written entry is evicted first
+export class TtlCache<V> {
+  private readonly entries = new Map<string, { value: V; expiresAt: number }>();
+  private readonly maxSize: number;
+  private readonly ttlMs: number;
+
+  constructor(maxSize: number, ttlMs: number) {
+    this.maxSize = maxSize;
+    this.ttlMs = ttlMs;
+  }
+
+  get(key: string): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      return undefined;
+    }
+
+    if (entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      return undefined;
+    }
+
+    return entry.value;
+  }
+
+  set(key: string, value: V): void {
+    // Re-inserting moves the key to the end of the Map's insertion order
+    this.entries.delete(key);
+
+    if (this.entries.size >= this.maxSize) {
+      this.entries.delete(this.entries.keys().next().value as string);
+    }
+
+    this.entries.set(key, { value, expiresAt: Date.now() + this.ttlMs });
+  }
+
+  delete(key: string): void {
+    this.entries.delete(key);
+  }
+}
+
+export type RequestParams = Record<string, string>;
+
+// Shared default for absent path/query parameters so requests without them allocate nothing
+export const EMPTY_PARAMS: RequestParams = Object.freeze({}) as RequestParams;
+
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+// Postgres' ISO text form of a timestamptz, e.g. 2025-01-26 14:00:00.123456+00
+const PG_TIMESTAMPTZ_PATTERN = /^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(\.\d{1,6})?[+-]\d{2}(:\d{2}){0,2}$/;
+
+export interface PageCursor {
+  createdAt: string;
+  id: string;
+}
+
+export interface PageRequest {
+  limit: number;
+  after?: PageCursor;
+}
+
+// Opt-in keyset pagination: `limit`, plus `cursor` (the `page_cursor` of the last row already received).
+// Returns null when no limit is given, or undefined when the limit or cursor is malformed
+export function parsePageRequest(queryParams: RequestParams, maxLimit: number = 500): PageRequest | null | undefined {
+  if (queryParams.limit === undefined) {
+    return null;
+  }
+
+  const limit = Number(queryParams.limit);
+  if (!Number.isInteger(limit) || limit < 1) {
+    return undefined;
+  }
+
+  if (!queryParams.cursor) {
+    return { limit: Math.min(limit, maxLimit) };
+  }
+
+  const after = decodePageCursor(queryParams.cursor);
+  return after && { limit: Math.min(limit, maxLimit), after };
+}
+
+function decodePageCursor(cursor: string): PageCursor | undefined {
+  const decoded = Buffer.from(cursor, 'base64url').toString('utf8');
+  const separator = decoded.lastIndexOf('|');
+  const createdAt = decoded.slice(0, separator);
+  const id = decoded.slice(separator + 1);
+
+  if (separator < 0 || !PG_TIMESTAMPTZ_PATTERN.test(createdAt) || !UUID_PATTERN.test(id)) {
+    return undefined;
+  }
+
+  return { createdAt, id };
+}
+
+export interface KeysetPage {
+  cursorColumn: string;
+  condition?: string;
+  orderByLimit: string;
+}
+
+// Query fragments for a newest-first page over (created_at, id), appending their values to params.
+// The cursor carries created_at as Postgres text: a JS Date would truncate its microseconds and the
+// `<` comparison would then skip older rows sharing the last row's millisecond
+export function keysetPage(page: PageRequest, params: any[], alias?: string): KeysetPage {
+  const createdAt = alias ? `${alias}.created_at` : 'created_at';
+  const id = alias ? `${alias}.id` : 'id';
+  let condition: string | undefined;
+
+  if (page.after) {
+    params.push(page.after.createdAt, page.after.id);
+    condition = `(${createdAt}, ${id}) < ($${params.length - 1}::timestamptz, $${params.length}::uuid)`;
+  }
+
+  params.push(page.limit);
+
+  return {
+    // Unpadded base64url of "<created_at>|<id>"; translate() also drops the line breaks encode() inserts
+    cursorColumn: `rtrim(translate(encode(convert_to(${createdAt}::text || '|' || ${id}::text, 'UTF8'), 'base64'), '+/' || chr(10), '-_'), '=') AS page_cursor`,
+    condition,
+    orderByLimit: `ORDER BY ${createdAt} DESC, ${id} DESC LIMIT $${params.length}`,
+  };
+}
+
+// Shared 400 for a malformed `limit` or `cursor`
+export const INVALID_PAGE_REQUEST_RESPONSE = staticResponse(400, { error: 'Invalid pagination parameters' });
+
+export interface RouteContext {
+  event: APIGatewayProxyEvent;
+  pathParams: RequestParams;
+  queryParams: RequestParams;
+}
+
+export type RouteHandler = (ctx: RouteContext) => Promise<APIGatewayProxyResult>;
+
+// Routes are keyed by `${httpMethod} ${resource}`, matching the API Gateway resources wired to the function;
+// any other pair gets the shared 405
+export async function dispatchRoute(
+  routes: ReadonlyMap<string, RouteHandler>,
+  event: APIGatewayProxyEvent
+): Promise<APIGatewayProxyResult> {
+  const route = routes.get(`${event.httpMethod} ${event.resource}`);
+
+  if (!route) {
+    return METHOD_NOT_ALLOWED_RESPONSE;
+  }
+
+  return route({
+    event,
+    pathParams: (event.pathParameters || EMPTY_PARAMS) as RequestParams,
+    queryParams: (event.queryStringParameters || EMPTY_PARAMS) as RequestParams,
+  });
+}
+
+export function extractPathParams(event: any): RequestParams {
+  return event.pathParameters || EMPTY_PARAMS;
 }
 
-export function extractQueryParams(event: any): Record<string, string> {
-  return event.queryStringParameters || {};
+export function extractQueryParams(event: any): RequestParams {
+  return event.queryStringParameters || EMPTY_PARAMS;
 }
 
+// Parsed bodies keyed by event, so every caller handling the same request shares one JSON.parse
+const PARSED_BODIES = new WeakMap<object, any>();
+
 export function extractBody(event: any): any {
-  const body = event.body || '{}';
-  return typeof body === 'string' ? JSON.parse(body) : body;
+  if (PARSED_BODIES.has(event)) {
+    return PARSED_BODIES.get(event);
+  }
+
+  const body = event.body;
+  let parsed: any;
+
+  if (!body) {
+    parsed = {};
+  } else if (typeof body !== 'string') {
+    parsed = body;
+  } else {
+    // API Gateway base64-encodes bodies it treats as binary; decode once into a string for JSON.parse
+    parsed = JSON.parse(event.isBase64Encoded ? Buffer.from(body, 'base64').toString('utf8') : body);
+  }
+
+  PARSED_BODIES.set(event, parsed);
+  return parsed;
+}
+
+// Best-effort: start fetching credentials while the module loads (Lambda INIT phase) so the first invocation
+// usually finds them cached. Requests only wait on it while it is younger than SECRET_REQUEST_TIMEOUT_MS and
+// fetch for themselves if it failed. The connection itself is opened on first use.
+if (process.env.SECRET_ARN) {
+  credentialsPrefetchStartedAt = Date.now();
+  credentialsPrefetch = fetchDatabaseCredentials()
+    .catch(error => {
+      console.warn('Credential prefetch failed; will fetch on first query:', error.message);
+      return null;
+    })
+    .finally(() => {
+      credentialsPrefetch = null;
+    });
 }
\ No newline at end of file
@@ -1,97 +1,129 @@
 import { APIGatewayProxyEvent, APIGatewayProxyResult } from 'aws-lambda';
-import { executeQuery, lambdaResponse, extractPathParams, extractQueryParams, extractBody } from './db-utils';
+import { executeQuery, executePrepared, exists, lambdaResponse, staticResponse, findMissingField, parsePageRequest, keysetPage, INVALID_PAGE_REQUEST_RESPONSE, dispatchRoute, RouteHandler, RequestParams, extractBody } from './db-utils';
+
+// List views (the dashboard) only render summary fields; the larger JSONB/text rule columns are left to the detail query
+const LANGUAGE_LIST_COLUMNS = 'id, user_id, name, status, phonemes, syllables, created_at';
+const LANGUAGE_FULL_COLUMNS = `${LANGUAGE_LIST_COLUMNS}, alphabet_mappings, syllable_rules, exclusion_rules, rules`;
+
+const LANGUAGES_BY_USER_QUERY = `SELECT ${LANGUAGE_LIST_COLUMNS} FROM app_8b514_languages WHERE user_id = $1 ORDER BY created_at DESC`;
+const LANGUAGE_BY_ID_QUERY = `SELECT ${LANGUAGE_FULL_COLUMNS} FROM app_8b514_languages WHERE id = $1`;
+const LANGUAGE_BY_ID_AND_USER_QUERY = `SELECT ${LANGUAGE_FULL_COLUMNS} FROM app_8b514_languages WHERE id = $1 AND user_id = $2`;
+const INSERT_LANGUAGE_QUERY = `
+  INSERT INTO app_8b514_languages (user_id, name, status, phonemes, alphabet_mappings, syllables, syllable_rules, exclusion_rules, rules)
+  VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+  RETURNING ${LANGUAGE_FULL_COLUMNS}
+`;
+
+interface CreateLanguageBody {
+  user_id: string;
+  name: string;
+  status?: string;
+  phonemes?: Record<string, string[]>;
+  alphabet_mappings?: Record<string, Record<string, string>>;
+  syllables?: string;
+  syllable_rules?: Record<string, any>;
+  exclusion_rules?: any[];
+  rules?: string;
+}
+
+const CREATE_LANGUAGE_REQUIRED_FIELDS = ['user_id', 'name'] as const;
+
+const USER_ID_REQUIRED_RESPONSE = staticResponse(400, { error: 'User ID is required' });
+const LANGUAGE_ID_REQUIRED_RESPONSE = staticResponse(400, { error: 'Language ID is required' });
+const NO_FIELDS_TO_UPDATE_RESPONSE = staticResponse(400, { error: 'No fields to update' });
+const ACCESS_DENIED_RESPONSE = staticResponse(403, { error: 'Access denied' });
+const LANGUAGE_NOT_FOUND_RESPONSE = staticResponse(404, { error: 'Language not found' });
+const LANGUAGE_NOT_FOUND_OR_DENIED_RESPONSE = staticResponse(404, { error: 'Language not found or access denied' });
+
+// One entry per API Gateway resource wired to this function
+const ROUTES: ReadonlyMap<string, RouteHandler> = new Map<string, RouteHandler>([
+  ['GET /languages', ({ queryParams }) => getLanguages(queryParams)],
+  ['POST /languages', ({ event }) => createLanguage(extractBody(event))],
+  ['GET /languages/{languageId}', ({ pathParams, queryParams }) => getLanguage(pathParams.languageId, queryParams.userId)],
+  ['PUT /languages/{languageId}', ({ event, pathParams }) => updateLanguage(pathParams.languageId, extractBody(event))],
+  ['DELETE /languages/{languageId}', ({ pathParams, queryParams }) => deleteLanguage(pathParams.languageId, queryParams.userId)],
+  ['GET /users/{userId}/languages', ({ pathParams }) => getUserLanguages(pathParams.userId)],
+]);
 
 export const handler = async (event: APIGatewayProxyEvent): Promise<APIGatewayProxyResult> => {
   try {
-    const httpMethod = event.httpMethod;
-    const pathParams = extractPathParams(event);
-    const queryParams = extractQueryParams(event);
-    const resourcePath = event.resource || '';
-
-    switch (httpMethod) {
-      case 'GET':
-        if (resourcePath.includes('/users/{userId}/languages')) {
-          return await getUserLanguages(pathParams.userId);
-        } else if (pathParams.languageId) {
-          return await getLanguage(pathParams.languageId, queryParams.userId);
-        } else {
-          return await getLanguages(queryParams);
-        }
-      case 'POST':
-        return await createLanguage(extractBody(event));
-      case 'PUT':
-        return await updateLanguage(pathParams.languageId, extractBody(event));
-      case 'DELETE':
-        return await deleteLanguage(pathParams.languageId, queryParams.userId);
-      default:
-        return lambdaResponse(405, { error: 'Method not allowed' });
-    }
+    return await dispatchRoute(ROUTES, event);
   } catch (error) {
     console.error('Error in languages handler:', error);
     return lambdaResponse(500, { error: (error as Error).message });
   }
 };
 
-async function getLanguages(queryParams: Record<string, string>): Promise<APIGatewayProxyResult> {
+async function getLanguages(queryParams: RequestParams): Promise<APIGatewayProxyResult> {
   const userId = queryParams.userId;
+  const page = parsePageRequest(queryParams);
 
-  let query: string;
-  let params: any[] = [];
+  if (page === undefined) {
+    return INVALID_PAGE_REQUEST_RESPONSE;
+  }
+
+  if (!page) {
+    const result = userId
+      ? await executePrepared('languages-by-user', LANGUAGES_BY_USER_QUERY, [userId])
+      : await executeQuery(`SELECT ${LANGUAGE_LIST_COLUMNS} FROM app_8b514_languages ORDER BY created_at DESC`);
+
+    return lambdaResponse(200, result);
+  }
+
+  // Keyset pagination bounds the rows held in memory per request
+  const conditions: string[] = [];
+  const params: any[] = [];
 
   if (userId) {
-    query = 'SELECT * FROM app_8b514_languages WHERE user_id = $1 ORDER BY created_at DESC';
-    params = [userId];
-  } else {
-    query = 'SELECT * FROM app_8b514_languages ORDER BY created_at DESC';
+    params.push(userId);
+    conditions.push(`user_id = $${params.length}`);
   }
 
+  const keyset = keysetPage(page, params);
+  if (keyset.condition) {
+    conditions.push(keyset.condition);
+  }
+
+  const query = `
+    SELECT ${LANGUAGE_LIST_COLUMNS}, ${keyset.cursorColumn} FROM app_8b514_languages
+    ${conditions.length ? `WHERE ${conditions.join(' AND ')}` : ''}
+    ${keyset.orderByLimit}
+  `;
+
   const result = await executeQuery(query, params);
   return lambdaResponse(200, result);
 }
 
 async function getUserLanguages(userId: string): Promise<APIGatewayProxyResult> {
   if (!userId) {
-    return lambdaResponse(400, { error: 'User ID is required' });
+    return USER_ID_REQUIRED_RESPONSE;
   }
 
-  const query = 'SELECT * FROM app_8b514_languages WHERE user_id = $1 ORDER BY created_at DESC';
-  const result = await executeQuery(query, [userId]);
+  const result = await executePrepared('languages-by-user', LANGUAGES_BY_USER_QUERY, [userId]);
 
   return lambdaResponse(200, result);
 }
 
 async function getLanguage(languageId: string, userId?: string): Promise<APIGatewayProxyResult> {
   if (!languageId) {
-    return lambdaResponse(400, { error: 'Language ID is required' });
+    return LANGUAGE_ID_REQUIRED_RESPONSE;
   }
 
-  let query: string;
-  let params: any[];
-
-  if (userId) {
-    query = 'SELECT * FROM app_8b514_languages WHERE id = $1 AND user_id = $2';
-    params = [languageId, userId];
-  } else {
-    query = 'SELECT * FROM app_8b514_languages WHERE id = $1';
-    params = [languageId];
-  }
-
-  const result = await executeQuery(query, params);
+  const result = userId
+    ? await executePrepared('language-by-id-and-user', LANGUAGE_BY_ID_AND_USER_QUERY, [languageId, userId])
+    : await executePrepared('language-by-id', LANGUAGE_BY_ID_QUERY, [languageId]);
 
   if (!result.length) {
-    return lambdaResponse(404, { error: 'Language not found' });
+    return LANGUAGE_NOT_FOUND_RESPONSE;
   }
 
   return lambdaResponse(200, result[0]);
 }
 
-async function createLanguage(languageData: any): Promise<APIGatewayProxyResult> {
-  const requiredFields = ['user_id', 'name'];
-
-  for (const field of requiredFields) {
-    if (!languageData[field]) {
-      return lambdaResponse(400, { error: `Missing required field: ${field}` });
-    }
+async function createLanguage(languageData: CreateLanguageBody): Promise<APIGatewayProxyResult> {
+  const missingField = findMissingField(languageData, CREATE_LANGUAGE_REQUIRED_FIELDS);
+  if (missingField) {
+    return lambdaResponse(400, { error: `Missing required field: ${missingField}` });
   }
 
   const phonemes = languageData.phonemes || {
@@ -110,13 +142,7 @@ async function createLanguage(languageData: any): Promise<APIGatewayProxyResult>
   const rules = languageData.rules || '';
   const status = languageData.status || 'active';
 
-  const query = `
-    INSERT INTO app_8b514_languages (user_id, name, status, phonemes, alphabet_mappings, syllables, syllable_rules, exclusion_rules, rules)
-    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-    RETURNING *
-  `;
-
-  const result = await executeQuery(query, [
+  const result = await executePrepared('insert-language', INSERT_LANGUAGE_QUERY, [
     languageData.user_id,
     languageData.name,
     status,
@@ -133,7 +159,7 @@ async function createLanguage(languageData: any): Promise<APIGatewayProxyResult>
 
 async function updateLanguage(languageId: string, languageData: any): Promise<APIGatewayProxyResult> {
   if (!languageId) {
-    return lambdaResponse(400, { error: 'Language ID is required' });
+    return LANGUAGE_ID_REQUIRED_RESPONSE;
   }
 
   const updateFields: string[] = [];
@@ -181,34 +207,35 @@ async function updateLanguage(languageId: string, languageData: any): Promise<AP
   }
 
   if (!updateFields.length) {
-    return lambdaResponse(400, { error: 'No fields to update' });
+    return NO_FIELDS_TO_UPDATE_RESPONSE;
   }
 
-  if (languageData.user_id) {
-    const verifyQuery = 'SELECT user_id FROM app_8b514_languages WHERE id = $1';
-    const verifyResult = await executeQuery(verifyQuery, [languageId]);
-
-    if (!verifyResult.length) {
-      return lambdaResponse(404, { error: 'Language not found' });
-    }
+  params.push(languageId);
+  let whereClause = `id = $${paramIndex++}`;
 
-    if (verifyResult[0].user_id !== languageData.user_id) {
-      return lambdaResponse(403, { error: 'Access denied' });
-    }
+  if (languageData.user_id) {
+    params.push(languageData.user_id);
+    whereClause += ` AND user_id = $${paramIndex}`;
   }
 
-  params.push(languageId);
   const query = `
     UPDATE app_8b514_languages 
     SET ${updateFields.join(', ')}
-    WHERE id = $${paramIndex}
+    WHERE ${whereClause}
     RETURNING *
   `;
 
   const result = await executeQuery(query, params);
 
   if (!result.length) {
-    return lambdaResponse(404, { error: 'Language not found' });
+    // Only on a miss: tell a missing language apart from one owned by someone else
+    if (languageData.user_id) {
+      if (await exists('SELECT 1 FROM app_8b514_languages WHERE id = $1', [languageId])) {
+        return ACCESS_DENIED_RESPONSE;
+      }
+    }
+
+    return LANGUAGE_NOT_FOUND_RESPONSE;
   }
 
   return lambdaResponse(200, result[0]);
@@ -216,7 +243,7 @@ async function updateLanguage(languageId: string, languageData: any): Promise<AP
 
 async function deleteLanguage(languageId: string, userId?: string): Promise<APIGatewayProxyResult> {
   if (!languageId) {
-    return lambdaResponse(400, { error: 'Language ID is required' });
+    return LANGUAGE_ID_REQUIRED_RESPONSE;
   }
 
   let query: string;
@@ -233,7 +260,7 @@ async function deleteLanguage(languageId: string, userId?: string): Promise<APIG
   const result = await executeQuery(query, params);
 
   if (!result.length) {
-    return lambdaResponse(404, { error: 'Language not found or access denied' });
+    return LANGUAGE_NOT_FOUND_OR_DENIED_RESPONSE;
   }
 
   return lambdaResponse(200, { message: 'Language deleted successfully', id: result[0].id });
@@ -1,16 +1,10 @@
 import { APIGatewayProxyEvent, APIGatewayProxyResult, Context } from 'aws-lambda';
-import { Pool } from 'pg';
-import { SecretsManagerClient, GetSecretValueCommand } from '@aws-sdk/client-secrets-manager';
+import { Pool, PoolClient } from 'pg';
+import * as fs from 'fs';
 import * as https from 'https';
+import * as path from 'path';
 import * as url from 'url';
-
-interface DatabaseCredentials {
-  host: string;
-  port: number;
-  dbname: string;
-  username: string;
-  password: string;
-}
+import { getDatabaseCredentials } from './db-utils';
 
 interface Migration {
   version: string;
@@ -18,40 +12,88 @@ interface Migration {
   sql: string;
 }
 
+interface AppliedMigration {
+  version: string;
+  description: string;
+  execution_time_ms: number;
+}
+
 interface MigrationResult {
   success: boolean;
   message: string;
   applied_count?: number;
-  applied_migrations?: any[];
+  applied_migrations?: AppliedMigration[];
   total_execution_time_ms?: number;
   error?: string;
 }
 
-class MigrationRunner {
-  private pool: Pool | null = null;
-  private secretsClient: SecretsManagerClient;
+interface MigrationManifestEntry {
+  version: string;
+  description: string;
+  file: string;
+}
 
-  constructor() {
-    this.secretsClient = new SecretsManagerClient({});
+// SQL bodies ship as files next to the handler (copied into dist/migrations at build time)
+const MIGRATIONS_DIR = path.join(__dirname, 'migrations');
+
+const MIGRATION_MANIFEST: readonly MigrationManifestEntry[] = [
+  {
+    version: '20250101_120000',
+    description: 'Initial PhaserAI database schema',
+    file: '20250101_120000_initial_schema.sql'
+  },
+  {
+    version: '20250102_143000',
+    description: 'Add etymology and validation tables',
+    file: '20250102_143000_add_etymology_tables.sql'
+  },
+  {
+    version: '20250103_091500',
+    description: 'Add user preferences table',
+    file: '20250103_091500_add_user_preferences.sql'
+  },
+  {
+    version: '20250104_100000',
+    description: 'Add syllable_rules column',
+    file: '20250104_100000_add_syllable_rules.sql'
+  },
+  {
+    version: '20250105_140000',
+    description: 'Add exclusion_rules column',
+    file: '20250105_140000_add_exclusion_rules.sql'
+  },
+  {
+    version: '20250126_140000',
+    description: 'Add language status column',
+    file: '20250126_140000_add_language_status.sql'
+  },
+  {
+    version: '20261015_090000',
+    description: 'Add composite indexes for word, translation and language listings',
+    file: '20261015_090000_add_listing_indexes.sql'
   }
+];
+
+// Read once per container at module load
+const MIGRATIONS: readonly Migration[] = Object.freeze(MIGRATION_MANIFEST.map(({ version, description, file }) => ({
+  version,
+  description,
+  sql: fs.readFileSync(path.join(MIGRATIONS_DIR, file), 'utf8')
+})));
+
+class MigrationRunner {
+  private pool: Pool | null = null;
 
   async getDbConnection(): Promise<Pool> {
     if (this.pool) {
       return this.pool;
     }
 
-    const secretArn = process.env.SECRET_ARN;
-    if (!secretArn) {
-      throw new Error('SECRET_ARN environment variable not set');
-    }
-
     try {
-      const command = new GetSecretValueCommand({ SecretId: secretArn });
-      const response = await this.secretsClient.send(command);
-      const secret: DatabaseCredentials = JSON.parse(response.SecretString!);
+      const secret = await getDatabaseCredentials();
 
       this.pool = new Pool({
-        host: secret.host || process.env.DB_ENDPOINT,
+        host: process.env.DB_PROXY_ENDPOINT || secret.host || process.env.DB_ENDPOINT,
         port: secret.port || 5432,
         database: secret.dbname,
         user: secret.username,
@@ -116,62 +158,29 @@ class MigrationRunner {
     }
   }
 
-  getMigrations(): Migration[] {
-    return [
-      {
-        version: '20250101_120000',
-        description: 'Initial PhaserAI database schema',
-        sql: this.getInitialSchemaMigration()
-      },
-      {
-        version: '20250102_143000',
-        description: 'Add etymology and validation tables',
-        sql: this.getEtymologyTablesMigration()
-      },
-      {
-        version: '20250103_091500',
-        description: 'Add user preferences table',
-        sql: this.getUserPreferencesMigration()
-      },
-      {
-        version: '20250104_100000',
-        description: 'Add syllable_rules column',
-        sql: this.getSyllableRulesMigration()
-      },
-      {
-        version: '20250105_140000',
-        description: 'Add exclusion_rules column',
-        sql: this.getExclusionRulesMigration()
-      },
-      {
-        version: '20250126_140000',
-        description: 'Add language status column',
-        sql: this.getLanguageStatusMigration()
-      }
-    ];
+  getMigrations(): readonly Migration[] {
+    return MIGRATIONS;
   }
 
-  async getPendingMigrations(): Promise<Migration[]> {
-    const allMigrations = this.getMigrations();
-    const appliedVersions = await this.getAppliedMigrations();
-    
-    return allMigrations.filter(m => !appliedVersions.includes(m.version));
-  }
+  async getPendingMigrations(appliedVersions?: string[]): Promise<Migration[]> {
+    const applied = new Set(appliedVersions ?? await this.getAppliedMigrations());
 
-  async applyMigration(migration: Migration): Promise<number> {
-    const pool = await this.getDbConnection();
-    const client = await pool.connect();
+    return MIGRATIONS.filter(m => !applied.has(m.version));
+  }
 
+  async applyMigration(client: PoolClient, migration: Migration): Promise<number> {
     const { version, description, sql } = migration;
     console.log(`Applying migration: ${version} - ${description}`);
 
-    const startTime = Date.now();
+    // Monotonic clock: unaffected by wall-clock (NTP) adjustments during the migration
+    const startTime = process.hrtime.bigint();
 
     try {
       await client.query(sql);
-      
-      const executionTime = Date.now() - startTime;
-      
+
+      const executionTime = Number((process.hrtime.bigint() - startTime) / 1_000_000n);
+
+      // Record each migration as soon as it commits, so a run cut short (timeout, dropped connection) doesn't re-apply it
       await client.query(`
         INSERT INTO schema_migrations (version, applied_at, execution_time_ms, description)
         VALUES ($1, NOW(), $2, $3)
@@ -184,9 +193,9 @@ class MigrationRunner {
       return executionTime;
     } catch (error) {
       console.error(`✗ Migration ${version} failed:`, error);
+      // Migrations carry their own BEGIN/COMMIT; leave the shared connection usable
+      await client.query('ROLLBACK').catch(() => undefined);
       throw error;
-    } finally {
-      client.release();
     }
   }
 
@@ -208,17 +217,24 @@ class MigrationRunner {
 
       console.log(`Found ${pending.length} pending migration(s)`);
 
-      const appliedMigrations = [];
+      const appliedMigrations: AppliedMigration[] = [];
       let totalTime = 0;
 
-      for (const migration of pending) {
-        const executionTime = await this.applyMigration(migration);
-        appliedMigrations.push({
-          version: migration.version,
-          description: migration.description,
-          execution_time_ms: executionTime
-        });
-        totalTime += executionTime;
+      const pool = await this.getDbConnection();
+      const client = await pool.connect();
+
+      try {
+        for (const migration of pending) {
+          const executionTime = await this.applyMigration(client, migration);
+          appliedMigrations.push({
+            version: migration.version,
+            description: migration.description,
+            execution_time_ms: executionTime
+          });
+          totalTime += executionTime;
+        }
+      } finally {
+        client.release();
       }
 
       console.log(`All migrations applied successfully (total: ${totalTime}ms)`);
@@ -246,7 +262,7 @@ class MigrationRunner {
       
       const allMigrations = this.getMigrations();
       const applied = await this.getAppliedMigrations();
-      const pending = await this.getPendingMigrations();
+      const pending = await this.getPendingMigrations(applied);
 
       return {
         success: true,
@@ -264,170 +280,19 @@ class MigrationRunner {
       };
     }
   }
-
-  private getInitialSchemaMigration(): string {
-    return `
-BEGIN;
-
-CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
-
-CREATE TABLE IF NOT EXISTS app_8b514_users (
-    user_id TEXT PRIMARY KEY,
-    email TEXT NOT NULL UNIQUE,
-    username TEXT NOT NULL,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS app_8b514_languages (
-    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
-    user_id TEXT REFERENCES app_8b514_users(user_id) ON DELETE CASCADE NOT NULL,
-    name TEXT NOT NULL,
-    phonemes JSONB NOT NULL DEFAULT '{"consonants":[],"vowels":[],"diphthongs":[]}'::jsonb,
-    alphabet_mappings JSONB NOT NULL DEFAULT '{"consonants":{},"vowels":{},"diphthongs":{}}'::jsonb,
-    syllables TEXT NOT NULL DEFAULT 'CV',
-    syllable_rules JSONB DEFAULT '{}'::jsonb,
-    rules TEXT NOT NULL DEFAULT '',
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS app_8b514_words (
-    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
-    language_id UUID REFERENCES app_8b514_languages(id) ON DELETE CASCADE NOT NULL,
-    word TEXT NOT NULL,
-    ipa TEXT NOT NULL,
-    pos TEXT[] NOT NULL DEFAULT '{}',
-    is_root BOOLEAN NOT NULL DEFAULT false,
-    embedding FLOAT[] NULL,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS app_8b514_translations (
-    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
-    word_id UUID REFERENCES app_8b514_words(id) ON DELETE CASCADE NOT NULL,
-    language_code TEXT NOT NULL,
-    meaning TEXT NOT NULL,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS app_8b514_subscriptions (
-    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
-    user_id TEXT REFERENCES app_8b514_users(user_id) ON DELETE CASCADE NOT NULL UNIQUE,
-    tier TEXT NOT NULL DEFAULT 'free',
-    stripe_customer_id TEXT NULL,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
-);
-
-CREATE INDEX IF NOT EXISTS idx_languages_user_id ON app_8b514_languages(user_id);
-CREATE INDEX IF NOT EXISTS idx_words_language_id ON app_8b514_words(language_id);
-CREATE INDEX IF NOT EXISTS idx_words_is_root ON app_8b514_words(is_root);
-CREATE INDEX IF NOT EXISTS idx_translations_word_id ON app_8b514_translations(word_id);
-CREATE INDEX IF NOT EXISTS idx_translations_language_code ON app_8b514_translations(language_code);
-CREATE INDEX IF NOT EXISTS idx_subscriptions_user_id ON app_8b514_subscriptions(user_id);
-
-COMMIT;
-    `;
-  }
-
-  private getEtymologyTablesMigration(): string {
-    return `
-BEGIN;
-
-CREATE TABLE IF NOT EXISTS app_8b514_word_etymology (
-    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
-    word_id UUID REFERENCES app_8b514_words(id) ON DELETE CASCADE NOT NULL,
-    parent_word_id UUID REFERENCES app_8b514_words(id) ON DELETE SET NULL,
-    derivation_type VARCHAR(50),
-    derivation_notes TEXT,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS app_8b514_phonological_violations (
-    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
-    word_id UUID REFERENCES app_8b514_words(id) ON DELETE CASCADE NOT NULL,
-    violation_type VARCHAR(100) NOT NULL,
-    description TEXT NOT NULL,
-    severity VARCHAR(20) DEFAULT 'warning',
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
-);
-
-CREATE INDEX IF NOT EXISTS idx_word_etymology_word ON app_8b514_word_etymology(word_id);
-CREATE INDEX IF NOT EXISTS idx_word_etymology_parent ON app_8b514_word_etymology(parent_word_id);
-CREATE INDEX IF NOT EXISTS idx_phonological_violations_word ON app_8b514_phonological_violations(word_id);
-
-COMMIT;
-    `;
-  }
-
-  private getUserPreferencesMigration(): string {
-    return `
-BEGIN;
-
-CREATE TABLE IF NOT EXISTS app_8b514_user_preferences (
-    user_id TEXT PRIMARY KEY REFERENCES app_8b514_users(user_id) ON DELETE CASCADE,
-    theme VARCHAR(20) DEFAULT 'light',
-    language VARCHAR(10) DEFAULT 'en',
-    notifications_enabled BOOLEAN DEFAULT true,
-    preferences JSONB DEFAULT '{}'::jsonb,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
-);
-
-CREATE INDEX IF NOT EXISTS idx_user_preferences_user_id ON app_8b514_user_preferences(user_id);
-
-COMMIT;
-    `;
-  }
-
-  private getSyllableRulesMigration(): string {
-    return `
-BEGIN;
-
-ALTER TABLE app_8b514_languages 
-ADD COLUMN IF NOT EXISTS syllable_rules JSONB DEFAULT '{}'::jsonb;
-
-COMMIT;
-    `;
-  }
-
-  private getExclusionRulesMigration(): string {
-    return `
-BEGIN;
-
-ALTER TABLE app_8b514_languages 
-ADD COLUMN IF NOT EXISTS exclusion_rules JSONB DEFAULT '[]'::jsonb;
-
-COMMIT;
-    `;
-  }
-
-  private getLanguageStatusMigration(): string {
-    return `
-BEGIN;
-
--- Add status column with default value 'active'
-ALTER TABLE app_8b514_languages 
-ADD COLUMN IF NOT EXISTS status VARCHAR(20) DEFAULT 'active' 
-CHECK (status IN ('active', 'in_progress', 'inactive', 'dead'));
-
--- Update existing languages to have 'active' status if NULL
-UPDATE app_8b514_languages 
-SET status = 'active' 
-WHERE status IS NULL;
-
--- Add index for status column for efficient filtering
-CREATE INDEX IF NOT EXISTS idx_languages_status ON app_8b514_languages(status);
-
--- Composite index for user_id and status for dashboard queries
-CREATE INDEX IF NOT EXISTS idx_languages_user_status ON app_8b514_languages(user_id, status);
-
-COMMIT;
-    `;
-  }
 }
 
 export const handler = async (event: any, context: Context): Promise<any> => {
-  console.log('Migration Lambda invoked with event:', JSON.stringify(event));
+  // CloudFormation events can carry large ResourceProperties; only dump them when explicitly requested
+  if (process.env.DEBUG_EVENTS === 'true') {
+    console.log('Migration Lambda invoked with event:', JSON.stringify(event));
+  } else {
+    console.log('Migration Lambda invoked:', {
+      requestType: event.RequestType,
+      action: event.action,
+      keys: Object.keys(event),
+    });
+  }
 
   const runner = new MigrationRunner();
 
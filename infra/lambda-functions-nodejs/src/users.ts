@@ -1,10 +1,32 @@
 import { APIGatewayProxyEvent, APIGatewayProxyResult } from 'aws-lambda';
-import { executeQuery, lambdaResponse, extractPathParams, extractBody } from './db-utils';
+import { executeQuery, executePrepared, lambdaResponse, staticResponse, findMissingField, METHOD_NOT_ALLOWED_RESPONSE, EMPTY_PARAMS, RequestParams, extractBody } from './db-utils';
+
+interface CreateUserBody {
+  user_id: string;
+  email: string;
+  username: string;
+}
+
+const CREATE_USER_REQUIRED_FIELDS = ['user_id', 'email', 'username'] as const;
+
+const UPSERT_USER_QUERY = `
+  INSERT INTO app_8b514_users (user_id, email, username)
+  VALUES ($1, $2, $3)
+  ON CONFLICT (user_id) 
+  DO UPDATE SET 
+    email = EXCLUDED.email,
+    username = EXCLUDED.username
+  RETURNING user_id, email, username, created_at
+`;
+
+const USER_ID_REQUIRED_RESPONSE = staticResponse(400, { error: 'User ID is required' });
+const NO_FIELDS_TO_UPDATE_RESPONSE = staticResponse(400, { error: 'No fields to update' });
+const USER_NOT_FOUND_RESPONSE = staticResponse(404, { error: 'User not found' });
 
 export const handler = async (event: APIGatewayProxyEvent): Promise<APIGatewayProxyResult> => {
   try {
     const httpMethod = event.httpMethod;
-    const pathParams = extractPathParams(event);
+    const pathParams = (event.pathParameters || EMPTY_PARAMS) as RequestParams;
 
     switch (httpMethod) {
       case 'GET':
@@ -14,7 +36,7 @@ export const handler = async (event: APIGatewayProxyEvent): Promise<APIGatewayPr
       case 'PUT':
         return await updateUser(pathParams.userId, extractBody(event));
       default:
-        return lambdaResponse(405, { error: 'Method not allowed' });
+        return METHOD_NOT_ALLOWED_RESPONSE;
     }
   } catch (error) {
     console.error('Error in users handler:', error);
@@ -24,39 +46,26 @@ export const handler = async (event: APIGatewayProxyEvent): Promise<APIGatewayPr
 
 async function getUser(userId: string): Promise<APIGatewayProxyResult> {
   if (!userId) {
-    return lambdaResponse(400, { error: 'User ID is required' });
+    return USER_ID_REQUIRED_RESPONSE;
   }
 
-  const query = 'SELECT * FROM app_8b514_users WHERE user_id = $1';
+  const query = 'SELECT user_id, email, username, created_at FROM app_8b514_users WHERE user_id = $1';
   const result = await executeQuery(query, [userId]);
 
   if (!result.length) {
-    return lambdaResponse(404, { error: 'User not found' });
+    return USER_NOT_FOUND_RESPONSE;
   }
 
   return lambdaResponse(200, result[0]);
 }
 
-async function createOrUpdateUser(userData: any): Promise<APIGatewayProxyResult> {
-  const requiredFields = ['user_id', 'email', 'username'];
-
-  for (const field of requiredFields) {
-    if (!userData[field]) {
-      return lambdaResponse(400, { error: `Missing required field: ${field}` });
-    }
+async function createOrUpdateUser(userData: CreateUserBody): Promise<APIGatewayProxyResult> {
+  const missingField = findMissingField(userData, CREATE_USER_REQUIRED_FIELDS);
+  if (missingField) {
+    return lambdaResponse(400, { error: `Missing required field: ${missingField}` });
   }
 
-  const query = `
-    INSERT INTO app_8b514_users (user_id, email, username)
-    VALUES ($1, $2, $3)
-    ON CONFLICT (user_id) 
-    DO UPDATE SET 
-      email = EXCLUDED.email,
-      username = EXCLUDED.username
-    RETURNING *
-  `;
-
-  const result = await executeQuery(query, [
+  const result = await executePrepared('upsert-user', UPSERT_USER_QUERY, [
     userData.user_id,
     userData.email,
     userData.username,
@@ -67,7 +76,7 @@ async function createOrUpdateUser(userData: any): Promise<APIGatewayProxyResult>
 
 async function updateUser(userId: string, userData: any): Promise<APIGatewayProxyResult> {
   if (!userId) {
-    return lambdaResponse(400, { error: 'User ID is required' });
+    return USER_ID_REQUIRED_RESPONSE;
   }
 
   const updateFields: string[] = [];
@@ -85,7 +94,7 @@ async function updateUser(userId: string, userData: any): Promise<APIGatewayProx
   }
 
   if (!updateFields.length) {
-    return lambdaResponse(400, { error: 'No fields to update' });
+    return NO_FIELDS_TO_UPDATE_RESPONSE;
   }
 
   params.push(userId);
@@ -99,7 +108,7 @@ async function updateUser(userId: string, userData: any): Promise<APIGatewayProx
   const result = await executeQuery(query, params);
 
   if (!result.length) {
-    return lambdaResponse(404, { error: 'User not found' });
+    return USER_NOT_FOUND_RESPONSE;
   }
 
   return lambdaResponse(200, result[0]);
@@ -1,239 +1,286 @@
 import { APIGatewayProxyEvent, APIGatewayProxyResult } from 'aws-lambda';
-import { executeQuery, lambdaResponse, extractPathParams, extractQueryParams, extractBody } from './db-utils';
+import { executeQuery, executePrepared, exists, TtlCache, lambdaResponse, staticResponse, findMissingField, parsePageRequest, keysetPage, INVALID_PAGE_REQUEST_RESPONSE, dispatchRoute, RouteHandler, RequestParams, extractBody } from './db-utils';
+
+interface TranslationInput {
+  language_code?: string;
+  meaning?: string;
+}
+
+interface CreateWordBody {
+  language_id: string;
+  word: string;
+  ipa: string;
+  user_id?: string;
+  pos?: string[];
+  is_root?: boolean;
+  embedding?: number[] | null;
+  translations?: TranslationInput[];
+}
+
+const CREATE_WORD_REQUIRED_FIELDS = ['language_id', 'word', 'ipa'] as const;
+
+// Named statements list their result columns: a cached plan over `*` fails with
+// "cached plan must not change result type" once a migration adds a column
+const WORD_COLUMNS = 'id, language_id, word, ipa, pos, is_root, embedding, created_at';
+const W_WORD_COLUMNS = WORD_COLUMNS.split(', ').map(column => `w.${column}`).join(', ');
+
+// Expands a JSONB array of {language_code, meaning} into translation rows for the word in `source`,
+// skipping entries without a meaning; clock_timestamp() keeps the submitted order visible in created_at
+function insertTranslationsFrom(source: string, translationsParam: string): string {
+  return `
+    INSERT INTO app_8b514_translations (word_id, language_code, meaning, created_at)
+    SELECT ${source}.id, COALESCE(NULLIF(t.value->>'language_code', ''), 'en'), t.value->>'meaning', clock_timestamp()
+    FROM ${source}, jsonb_array_elements(${translationsParam}::jsonb) WITH ORDINALITY AS t(value, position)
+    WHERE COALESCE(t.value->>'meaning', '') <> ''
+    ORDER BY t.position
+  `;
+}
+
+// Word insert and its translations (one JSONB parameter) in one round trip.
+// The word is only inserted when the language exists and, if $8 is given, belongs to that user
+const INSERT_WORD_WITH_TRANSLATIONS_QUERY = `
+  WITH new_word AS (
+    INSERT INTO app_8b514_words (language_id, word, ipa, pos, is_root, embedding)
+    SELECT l.id, $2, $3, $4, $5, $6
+    FROM app_8b514_languages l
+    WHERE l.id = $1 AND ($8::text IS NULL OR l.user_id = $8::text)
+    RETURNING ${WORD_COLUMNS}
+  ), new_translations AS (
+    ${insertTranslationsFrom('new_word', '$7')}
+    RETURNING *
+  )
+  SELECT ${WORD_COLUMNS},
+    COALESCE((SELECT json_agg(nt.* ORDER BY nt.created_at) FROM new_translations nt), '[]'::json) AS translations
+  FROM new_word
+`;
+
+const LANGUAGE_ID_REQUIRED_RESPONSE = staticResponse(400, { error: 'Language ID is required' });
+const WORD_ID_REQUIRED_RESPONSE = staticResponse(400, { error: 'Word ID is required' });
+const NO_FIELDS_TO_UPDATE_RESPONSE = staticResponse(400, { error: 'No fields to update' });
+const LANGUAGE_NOT_FOUND_OR_DENIED_RESPONSE = staticResponse(404, { error: 'Language not found or access denied' });
+const WORD_NOT_FOUND_RESPONSE = staticResponse(404, { error: 'Word not found' });
+const WORD_NOT_FOUND_OR_DENIED_RESPONSE = staticResponse(404, { error: 'Word not found or access denied' });
+
+// Words with their translations embedded; aggregating per word in a LATERAL subquery
+// avoids joining every translation onto the wide word row and grouping it back up
+const WORD_LIST_COLUMNS = `${W_WORD_COLUMNS}, tr.app_8b514_translations`;
+const WORDS_WITH_TRANSLATIONS_FROM = `
+  FROM app_8b514_words w
+  CROSS JOIN LATERAL (
+    SELECT COALESCE(json_agg(t ORDER BY t.created_at), '[]'::json) AS app_8b514_translations
+    FROM (
+      SELECT id, language_code, meaning, created_at
+      FROM app_8b514_translations
+      WHERE word_id = w.id
+    ) t
+  ) tr
+`;
+const WORDS_WITH_TRANSLATIONS_QUERY = `SELECT ${WORD_LIST_COLUMNS} ${WORDS_WITH_TRANSLATIONS_FROM}`;
+const WORDS_BY_LANGUAGE_QUERY = `${WORDS_WITH_TRANSLATIONS_QUERY} WHERE w.language_id = $1 ORDER BY w.created_at DESC`;
+const WORDS_BY_OWNED_LANGUAGE_QUERY = `
+  ${WORDS_WITH_TRANSLATIONS_QUERY}
+  WHERE w.language_id = $1
+    AND EXISTS (SELECT 1 FROM app_8b514_languages WHERE id = $1 AND user_id = $2)
+  ORDER BY w.created_at DESC
+`;
+const ALL_WORDS_QUERY = `${WORDS_WITH_TRANSLATIONS_QUERY} ORDER BY w.created_at DESC`;
+
+// A single word carries its full translation rows under `translations`, the shape createWord returns
+const WORD_WITH_TRANSLATIONS_QUERY = `
+  SELECT ${W_WORD_COLUMNS}, tr.translations
+  FROM app_8b514_words w
+  CROSS JOIN LATERAL (
+    SELECT COALESCE(json_agg(t ORDER BY t.created_at), '[]'::json) AS translations
+    FROM app_8b514_translations t
+    WHERE t.word_id = w.id
+  ) tr
+`;
+const WORD_BY_ID_QUERY = `${WORD_WITH_TRANSLATIONS_QUERY} WHERE w.id = $1`;
+const WORD_BY_ID_AND_USER_QUERY = `
+  ${WORD_WITH_TRANSLATIONS_QUERY}
+  JOIN app_8b514_languages l ON w.language_id = l.id
+  WHERE w.id = $1 AND l.user_id = $2
+`;
+
+const LANGUAGE_OWNED_BY_USER_QUERY = 'SELECT 1 FROM app_8b514_languages WHERE id = $1 AND user_id = $2';
+
+// Confirmed (languageId, userId) ownership pairs. Only positive results are cached, so a newly
+// created language is never reported as missing; a deleted one may read as owned for up to a minute
+const OWNERSHIP_CACHE = new TtlCache<true>(
+  Number(process.env.OWNERSHIP_CACHE_MAX_SIZE || 4096),
+  Number(process.env.OWNERSHIP_CACHE_TTL_MS || 60000)
+);
+
+function ownershipKey(languageId: string, userId: string): string {
+  return `${languageId}:${userId}`;
+}
+
+async function verifyLanguageOwnership(languageId: string, userId: string): Promise<boolean> {
+  const key = ownershipKey(languageId, userId);
+  if (OWNERSHIP_CACHE.get(key)) {
+    return true;
+  }
+
+  if (!(await exists(LANGUAGE_OWNED_BY_USER_QUERY, [languageId, userId]))) {
+    return false;
+  }
+
+  OWNERSHIP_CACHE.set(key, true);
+  return true;
+}
+
+const DELETE_WORD_BY_ID_QUERY = 'DELETE FROM app_8b514_words WHERE id = $1 RETURNING id';
+const DELETE_WORD_BY_ID_AND_USER_QUERY = `
+  DELETE FROM app_8b514_words
+  WHERE id = $1 AND language_id IN (
+    SELECT id FROM app_8b514_languages WHERE user_id = $2
+  )
+  RETURNING id
+`;
+
+// Translations travel as a single JSON parameter; anything but an array counts as none
+function translationsParam(translations: unknown): string {
+  return JSON.stringify(Array.isArray(translations) ? translations : []);
+}
+
+// One entry per API Gateway resource wired to this function
+const ROUTES: ReadonlyMap<string, RouteHandler> = new Map<string, RouteHandler>([
+  ['GET /words', ({ queryParams }) => getWords(queryParams)],
+  ['POST /words', ({ event }) => createWord(extractBody(event))],
+  ['GET /words/{wordId}', ({ pathParams, queryParams }) => getWord(pathParams.wordId, queryParams.userId)],
+  ['PUT /words/{wordId}', ({ event, pathParams }) => updateWord(pathParams.wordId, extractBody(event))],
+  ['DELETE /words/{wordId}', ({ pathParams, queryParams }) => deleteWord(pathParams.wordId, queryParams.userId)],
+  ['GET /languages/{languageId}/words', ({ pathParams, queryParams }) => getLanguageWords(pathParams.languageId, queryParams.userId)],
+]);
 
 export const handler = async (event: APIGatewayProxyEvent): Promise<APIGatewayProxyResult> => {
   try {
-    const httpMethod = event.httpMethod;
-    const pathParams = extractPathParams(event);
-    const queryParams = extractQueryParams(event);
-    const resourcePath = event.resource || '';
-
-    switch (httpMethod) {
-      case 'GET':
-        if (resourcePath.includes('/languages/{languageId}/words')) {
-          return await getLanguageWords(pathParams.languageId, queryParams.userId);
-        } else if (pathParams.wordId) {
-          return await getWord(pathParams.wordId, queryParams.userId);
-        } else {
-          return await getWords(queryParams);
-        }
-      case 'POST':
-        return await createWord(extractBody(event));
-      case 'PUT':
-        return await updateWord(pathParams.wordId, extractBody(event));
-      case 'DELETE':
-        return await deleteWord(pathParams.wordId, queryParams.userId);
-      default:
-        return lambdaResponse(405, { error: 'Method not allowed' });
-    }
+    return await dispatchRoute(ROUTES, event);
   } catch (error) {
     console.error('Error in words handler:', error);
     return lambdaResponse(500, { error: (error as Error).message });
   }
 };
 
-async function getWords(queryParams: Record<string, string>): Promise<APIGatewayProxyResult> {
+async function getWords(queryParams: RequestParams): Promise<APIGatewayProxyResult> {
   const languageId = queryParams.languageId;
   const userId = queryParams.userId;
+  const page = parsePageRequest(queryParams);
 
-  let query: string;
-  let params: any[] = [];
-
-  const baseQuery = `
-    SELECT 
-      w.*,
-      COALESCE(
-        json_agg(
-          json_build_object(
-            'id', t.id,
-            'language_code', t.language_code,
-            'meaning', t.meaning,
-            'created_at', t.created_at
-          ) ORDER BY t.created_at
-        ) FILTER (WHERE t.id IS NOT NULL),
-        '[]'::json
-      ) as app_8b514_translations
-    FROM app_8b514_words w
-    LEFT JOIN app_8b514_translations t ON w.id = t.word_id
-  `;
+  if (page === undefined) {
+    return INVALID_PAGE_REQUEST_RESPONSE;
+  }
 
   if (languageId && userId) {
-    const verifyQuery = 'SELECT id FROM app_8b514_languages WHERE id = $1 AND user_id = $2';
-    const verifyResult = await executeQuery(verifyQuery, [languageId, userId]);
-
-    if (!verifyResult.length) {
-      return lambdaResponse(404, { error: 'Language not found or access denied' });
+    if (!(await verifyLanguageOwnership(languageId, userId))) {
+      return LANGUAGE_NOT_FOUND_OR_DENIED_RESPONSE;
     }
+  }
+
+  if (!page) {
+    const result = languageId
+      ? await executePrepared('words-by-language', WORDS_BY_LANGUAGE_QUERY, [languageId])
+      : await executePrepared('all-words', ALL_WORDS_QUERY);
 
-    query = `${baseQuery} WHERE w.language_id = $1 GROUP BY w.id ORDER BY w.created_at DESC`;
-    params = [languageId];
-  } else if (languageId) {
-    query = `${baseQuery} WHERE w.language_id = $1 GROUP BY w.id ORDER BY w.created_at DESC`;
-    params = [languageId];
-  } else {
-    query = `${baseQuery} GROUP BY w.id ORDER BY w.created_at DESC`;
+    return lambdaResponse(200, result);
   }
 
+  const conditions: string[] = [];
+  const params: any[] = [];
+
+  if (languageId) {
+    params.push(languageId);
+    conditions.push(`w.language_id = $${params.length}`);
+  }
+
+  const keyset = keysetPage(page, params, 'w');
+  if (keyset.condition) {
+    conditions.push(keyset.condition);
+  }
+
+  const query = `
+    SELECT ${WORD_LIST_COLUMNS}, ${keyset.cursorColumn}
+    ${WORDS_WITH_TRANSLATIONS_FROM}
+    ${conditions.length ? `WHERE ${conditions.join(' AND ')}` : ''}
+    ${keyset.orderByLimit}
+  `;
+
   const result = await executeQuery(query, params);
   return lambdaResponse(200, result);
 }
 
 async function getLanguageWords(languageId: string, userId?: string): Promise<APIGatewayProxyResult> {
   if (!languageId) {
-    return lambdaResponse(400, { error: 'Language ID is required' });
+    return LANGUAGE_ID_REQUIRED_RESPONSE;
   }
 
-  if (userId) {
-    const verifyQuery = 'SELECT id FROM app_8b514_languages WHERE id = $1 AND user_id = $2';
-    const verifyResult = await executeQuery(verifyQuery, [languageId, userId]);
+  // Unless ownership is already cached, check it in the same statement as the word list.
+  // Rows prove ownership; an empty list is ambiguous and only then costs a second lookup
+  if (userId && !OWNERSHIP_CACHE.get(ownershipKey(languageId, userId))) {
+    const result = await executePrepared('words-by-owned-language', WORDS_BY_OWNED_LANGUAGE_QUERY, [languageId, userId]);
 
-    if (!verifyResult.length) {
-      return lambdaResponse(404, { error: 'Language not found or access denied' });
+    if (result.length) {
+      OWNERSHIP_CACHE.set(ownershipKey(languageId, userId), true);
+    } else if (!(await verifyLanguageOwnership(languageId, userId))) {
+      return LANGUAGE_NOT_FOUND_OR_DENIED_RESPONSE;
     }
-  }
 
-  const query = `
-    SELECT 
-      w.*,
-      COALESCE(
-        json_agg(
-          json_build_object(
-            'id', t.id,
-            'language_code', t.language_code,
-            'meaning', t.meaning,
-            'created_at', t.created_at
-          ) ORDER BY t.created_at
-        ) FILTER (WHERE t.id IS NOT NULL),
-        '[]'::json
-      ) as app_8b514_translations
-    FROM app_8b514_words w
-    LEFT JOIN app_8b514_translations t ON w.id = t.word_id
-    WHERE w.language_id = $1
-    GROUP BY w.id
-    ORDER BY w.created_at DESC
-  `;
+    return lambdaResponse(200, result);
+  }
 
-  const result = await executeQuery(query, [languageId]);
+  const result = await executePrepared('words-by-language', WORDS_BY_LANGUAGE_QUERY, [languageId]);
   return lambdaResponse(200, result);
 }
 
 async function getWord(wordId: string, userId?: string): Promise<APIGatewayProxyResult> {
   if (!wordId) {
-    return lambdaResponse(400, { error: 'Word ID is required' });
+    return WORD_ID_REQUIRED_RESPONSE;
   }
 
-  let query: string;
-  let params: any[];
-
-  if (userId) {
-    query = `
-      SELECT w.* FROM app_8b514_words w
-      JOIN app_8b514_languages l ON w.language_id = l.id
-      WHERE w.id = $1 AND l.user_id = $2
-    `;
-    params = [wordId, userId];
-  } else {
-    query = 'SELECT * FROM app_8b514_words WHERE id = $1';
-    params = [wordId];
-  }
-
-  const result = await executeQuery(query, params);
+  const result = userId
+    ? await executePrepared('word-by-id-and-user', WORD_BY_ID_AND_USER_QUERY, [wordId, userId])
+    : await executePrepared('word-by-id', WORD_BY_ID_QUERY, [wordId]);
 
   if (!result.length) {
-    return lambdaResponse(404, { error: 'Word not found' });
+    return WORD_NOT_FOUND_RESPONSE;
   }
 
-  const word = result[0];
-
-  const translationsQuery = 'SELECT * FROM app_8b514_translations WHERE word_id = $1 ORDER BY created_at';
-  const translations = await executeQuery(translationsQuery, [wordId]);
-  word.translations = translations || [];
-
-  return lambdaResponse(200, word);
+  return lambdaResponse(200, result[0]);
 }
 
-async function createWord(wordData: any): Promise<APIGatewayProxyResult> {
-  const requiredFields = ['language_id', 'word', 'ipa'];
-
-  for (const field of requiredFields) {
-    if (!wordData[field]) {
-      return lambdaResponse(400, { error: `Missing required field: ${field}` });
-    }
-  }
-
-  if (wordData.user_id) {
-    const verifyQuery = 'SELECT id FROM app_8b514_languages WHERE id = $1 AND user_id = $2';
-    const verifyResult = await executeQuery(verifyQuery, [wordData.language_id, wordData.user_id]);
-
-    if (!verifyResult.length) {
-      return lambdaResponse(404, { error: 'Language not found or access denied' });
-    }
+async function createWord(wordData: CreateWordBody): Promise<APIGatewayProxyResult> {
+  const missingField = findMissingField(wordData, CREATE_WORD_REQUIRED_FIELDS);
+  if (missingField) {
+    return lambdaResponse(400, { error: `Missing required field: ${missingField}` });
   }
 
   const pos = wordData.pos || [];
   const isRoot = wordData.is_root || false;
   const embedding = wordData.embedding || null;
 
-  const query = `
-    INSERT INTO app_8b514_words (language_id, word, ipa, pos, is_root, embedding)
-    VALUES ($1, $2, $3, $4, $5, $6)
-    RETURNING *
-  `;
-
-  const result = await executeQuery(query, [
+  const result = await executePrepared('insert-word-with-translations', INSERT_WORD_WITH_TRANSLATIONS_QUERY, [
     wordData.language_id,
     wordData.word,
     wordData.ipa,
     pos,
     isRoot,
-    embedding
+    embedding,
+    translationsParam(wordData.translations),
+    wordData.user_id || null
   ]);
 
-  const wordId = result[0].id;
-  const translations: any[] = [];
-
-  if (wordData.translations) {
-    for (const translation of wordData.translations) {
-      if (translation.meaning) {
-        const insertTranslationQuery = `
-          INSERT INTO app_8b514_translations (word_id, language_code, meaning)
-          VALUES ($1, $2, $3)
-          RETURNING *
-        `;
-        const translationResult = await executeQuery(insertTranslationQuery, [
-          wordId,
-          translation.language_code || 'en',
-          translation.meaning
-        ]);
-        if (translationResult.length) {
-          translations.push(translationResult[0]);
-        }
-      }
-    }
+  if (!result.length) {
+    return LANGUAGE_NOT_FOUND_OR_DENIED_RESPONSE;
   }
 
   const wordResult = result[0];
-  wordResult.translations = translations;
 
   return lambdaResponse(201, wordResult);
 }
 
 async function updateWord(wordId: string, wordData: any): Promise<APIGatewayProxyResult> {
   if (!wordId) {
-    return lambdaResponse(400, { error: 'Word ID is required' });
-  }
-
-  if (wordData.user_id) {
-    const verifyQuery = `
-      SELECT w.id FROM app_8b514_words w
-      JOIN app_8b514_languages l ON w.language_id = l.id
-      WHERE w.id = $1 AND l.user_id = $2
-    `;
-    const verifyResult = await executeQuery(verifyQuery, [wordId, wordData.user_id]);
-
-    if (!verifyResult.length) {
-      return lambdaResponse(404, { error: 'Word not found or access denied' });
-    }
+    return WORD_ID_REQUIRED_RESPONSE;
   }
 
   const updateFields: string[] = [];
@@ -266,39 +313,46 @@ async function updateWord(wordId: string, wordData: any): Promise<APIGatewayProx
   }
 
   if (!updateFields.length) {
-    return lambdaResponse(400, { error: 'No fields to update' });
+    return NO_FIELDS_TO_UPDATE_RESPONSE;
   }
 
   params.push(wordId);
-  const query = `
-    UPDATE app_8b514_words 
-    SET ${updateFields.join(', ')}
-    WHERE id = $${paramIndex}
-    RETURNING *
+  let whereClause = `id = $${paramIndex++}`;
+
+  // Ownership is checked by the UPDATE itself rather than a separate verify query
+  if (wordData.user_id) {
+    whereClause += ` AND language_id IN (SELECT id FROM app_8b514_languages WHERE user_id = $${paramIndex++})`;
+    params.push(wordData.user_id);
+  }
+
+  let query = `
+    WITH updated_word AS (
+      UPDATE app_8b514_words 
+      SET ${updateFields.join(', ')}
+      WHERE ${whereClause}
+      RETURNING *
+    )
   `;
 
+  // Replacing translations rides along in the same statement; both CTEs only touch rows of the updated word
+  if (wordData.translations) {
+    params.push(translationsParam(wordData.translations));
+    query += `
+    , deleted_translations AS (
+      DELETE FROM app_8b514_translations
+      WHERE word_id IN (SELECT id FROM updated_word)
+    ), new_translations AS (
+      ${insertTranslationsFrom('updated_word', `$${paramIndex++}`)}
+    )
+    `;
+  }
+
+  query += 'SELECT * FROM updated_word';
+
   const result = await executeQuery(query, params);
 
   if (!result.length) {
-    return lambdaResponse(404, { error: 'Word not found' });
-  }
-
-  if (wordData.translations) {
-    await executeQuery('DELETE FROM app_8b514_translations WHERE word_id = $1', [wordId]);
-
-    for (const translation of wordData.translations) {
-      if (translation.meaning) {
-        const insertTranslationQuery = `
-          INSERT INTO app_8b514_translations (word_id, language_code, meaning)
-          VALUES ($1, $2, $3)
-        `;
-        await executeQuery(insertTranslationQuery, [
-          wordId,
-          translation.language_code || 'en',
-          translation.meaning
-        ]);
-      }
-    }
+    return wordData.user_id ? WORD_NOT_FOUND_OR_DENIED_RESPONSE : WORD_NOT_FOUND_RESPONSE;
   }
 
   return lambdaResponse(200, result[0]);
@@ -306,30 +360,15 @@ async function updateWord(wordId: string, wordData: any): Promise<APIGatewayProx
 
 async function deleteWord(wordId: string, userId?: string): Promise<APIGatewayProxyResult> {
   if (!wordId) {
-    return lambdaResponse(400, { error: 'Word ID is required' });
+    return WORD_ID_REQUIRED_RESPONSE;
   }
 
-  let query: string;
-  let params: any[];
-
-  if (userId) {
-    query = `
-      DELETE FROM app_8b514_words 
-      WHERE id = $1 AND language_id IN (
-        SELECT id FROM app_8b514_languages WHERE user_id = $2
-      )
-      RETURNING id
-    `;
-    params = [wordId, userId];
-  } else {
-    query = 'DELETE FROM app_8b514_words WHERE id = $1 RETURNING id';
-    params = [wordId];
-  }
-
-  const result = await executeQuery(query, params);
+  const result = userId
+    ? await executePrepared('delete-word-by-id-and-user', DELETE_WORD_BY_ID_AND_USER_QUERY, [wordId, userId])
+    : await executePrepared('delete-word-by-id', DELETE_WORD_BY_ID_QUERY, [wordId]);
 
   if (!result.length) {
-    return lambdaResponse(404, { error: 'Word not found or access denied' });
+    return WORD_NOT_FOUND_OR_DENIED_RESPONSE;
   }
 
   return lambdaResponse(200, { message: 'Word deleted successfully', id: result[0].id });
@@ -10,6 +10,7 @@ export interface MigrationStackProps extends cdk.StackProps {
   vpc: ec2.IVpc;
   databaseSecretArn: string;
   databaseEndpoint: string;
+  databaseProxyEndpoint: string;
   lambdaSecurityGroup: ec2.ISecurityGroup;
 }
 
@@ -19,7 +20,7 @@ export class MigrationStack extends cdk.Stack {
   constructor(scope: Construct, id: string, props: MigrationStackProps) {
     super(scope, id, props);
 
-    const { vpc, databaseSecretArn, databaseEndpoint, lambdaSecurityGroup } = props;
+    const { vpc, databaseSecretArn, databaseEndpoint, databaseProxyEndpoint, lambdaSecurityGroup } = props;
 
 
 
@@ -39,6 +40,7 @@ export class MigrationStack extends cdk.Stack {
       environment: {
         SECRET_ARN: databaseSecretArn,
         DB_ENDPOINT: databaseEndpoint,
+        DB_PROXY_ENDPOINT: databaseProxyEndpoint,
         NODE_ENV: 'production',
       },
       logRetention: logs.RetentionDays.ONE_MONTH,
@@ -10,7 +10,10 @@ export interface ProductionApiStackProps extends cdk.StackProps {
   vpc: ec2.IVpc;
   databaseSecretArn: string;
   databaseEndpoint: string;
+  databaseProxyEndpoint: string;
   lambdaSecurityGroup: ec2.ISecurityGroup;
+  // Pre-initialized words containers (default 5); 0 disables provisioned concurrency
+  wordsProvisionedConcurrency?: number;
 }
 
 export class ProductionApiStack extends cdk.Stack {
@@ -19,7 +22,7 @@ export class ProductionApiStack extends cdk.Stack {
   constructor(scope: Construct, id: string, props: ProductionApiStackProps) {
     super(scope, id, props);
 
-    const { vpc, databaseSecretArn, databaseEndpoint, lambdaSecurityGroup } = props;
+    const { vpc, databaseSecretArn, databaseEndpoint, databaseProxyEndpoint, lambdaSecurityGroup, wordsProvisionedConcurrency = 5 } = props;
 
 
 
@@ -35,6 +38,9 @@ export class ProductionApiStack extends cdk.Stack {
       environment: {
         SECRET_ARN: databaseSecretArn,
         DB_ENDPOINT: databaseEndpoint,
+        DB_PROXY_ENDPOINT: databaseProxyEndpoint,
+        // Connections per container; concurrent containers * DB_POOL_MAX must stay below RDS max_connections
+        DB_POOL_MAX: '1',
       },
       logRetention: logs.RetentionDays.ONE_WEEK,
     };
@@ -69,6 +75,15 @@ export class ProductionApiStack extends cdk.Stack {
       code: lambda.Code.fromAsset('lambda-functions-nodejs/lambda-package.zip'),
     });
 
+    // API Gateway invokes words through an alias so provisioned concurrency keeps containers initialized ahead of
+    // traffic: runtime start, module load and the credentials prefetch are paid before the first request. The
+    // database connection is still opened per container on first use (idle ones close after 30s in the pool).
+    const wordsAlias = new lambda.Alias(this, 'WordsFunctionLiveAlias', {
+      aliasName: 'live',
+      version: wordsFunction.currentVersion,
+      provisionedConcurrentExecutions: wordsProvisionedConcurrency > 0 ? wordsProvisionedConcurrency : undefined,
+    });
+
     // IPA Synthesis Lambda function (no database required)
     const ipaSynthesisFunction = new lambda.Function(this, 'IPASynthesisFunction', {
       runtime: lambda.Runtime.NODEJS_20_X,
@@ -102,6 +117,8 @@ export class ProductionApiStack extends cdk.Stack {
     this.api = new apigateway.RestApi(this, 'PhaserAiProductionApi', {
       restApiName: 'PhaserAI Production API',
       description: 'Production API for PhaserAI conlang application',
+      // Compress responses over 1 KiB (e.g. language lists with JSONB phonemes) for clients sending Accept-Encoding
+      minCompressionSize: cdk.Size.kibibytes(1),
       defaultCorsPreflightOptions: {
         allowOrigins: apigateway.Cors.ALL_ORIGINS,
         allowMethods: apigateway.Cors.ALL_METHODS,
@@ -141,15 +158,15 @@ export class ProductionApiStack extends cdk.Stack {
     const wordsResource = this.api.root.addResource('words');
     const wordResource = wordsResource.addResource('{wordId}');
     
-    wordsResource.addMethod('GET', new apigateway.LambdaIntegration(wordsFunction));
-    wordsResource.addMethod('POST', new apigateway.LambdaIntegration(wordsFunction));
-    wordResource.addMethod('GET', new apigateway.LambdaIntegration(wordsFunction));
-    wordResource.addMethod('PUT', new apigateway.LambdaIntegration(wordsFunction));
-    wordResource.addMethod('DELETE', new apigateway.LambdaIntegration(wordsFunction));
+    wordsResource.addMethod('GET', new apigateway.LambdaIntegration(wordsAlias));
+    wordsResource.addMethod('POST', new apigateway.LambdaIntegration(wordsAlias));
+    wordResource.addMethod('GET', new apigateway.LambdaIntegration(wordsAlias));
+    wordResource.addMethod('PUT', new apigateway.LambdaIntegration(wordsAlias));
+    wordResource.addMethod('DELETE', new apigateway.LambdaIntegration(wordsAlias));
 
     // /languages/{languageId}/words resource
     const languageWordsResource = languageResource.addResource('words');
-    languageWordsResource.addMethod('GET', new apigateway.LambdaIntegration(wordsFunction));
+    languageWordsResource.addMethod('GET', new apigateway.LambdaIntegration(wordsAlias));
 
     // /synthesize-ipa resource
     const synthesizeIpaResource = this.api.root.addResource('synthesize-ipa');
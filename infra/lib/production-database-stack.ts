@@ -11,10 +11,12 @@ export interface ProductionDatabaseStackProps extends cdk.StackProps {
 
 export class ProductionDatabaseStack extends cdk.Stack {
   public readonly database: rds.DatabaseInstance;
+  public readonly databaseProxy: rds.DatabaseProxy;
   public readonly databaseSecret: secretsmanager.Secret;
   public readonly vpc: ec2.Vpc;
   public readonly lambdaSecurityGroup: ec2.SecurityGroup;
   public readonly databaseSecurityGroup: ec2.SecurityGroup;
+  public readonly proxySecurityGroup: ec2.SecurityGroup;
 
   constructor(scope: Construct, id: string, props: ProductionDatabaseStackProps) {
     super(scope, id, props);
@@ -70,6 +72,13 @@ export class ProductionDatabaseStack extends cdk.Stack {
       allowAllOutbound: true,
     });
 
+    // Create security group for RDS Proxy
+    this.proxySecurityGroup = new ec2.SecurityGroup(this, 'ProxySecurityGroup', {
+      vpc: this.vpc,
+      description: 'Security group for RDS Proxy',
+      allowAllOutbound: true,
+    });
+
     // Allow Lambda to access RDS
     this.databaseSecurityGroup.addIngressRule(
       this.lambdaSecurityGroup,
@@ -77,6 +86,18 @@ export class ProductionDatabaseStack extends cdk.Stack {
       'PostgreSQL access from Lambda'
     );
 
+    // Allow Lambda to access RDS Proxy, and the proxy to reach RDS
+    this.proxySecurityGroup.addIngressRule(
+      this.lambdaSecurityGroup,
+      ec2.Port.tcp(5432),
+      'PostgreSQL access from Lambda via RDS Proxy'
+    );
+    this.databaseSecurityGroup.addIngressRule(
+      this.proxySecurityGroup,
+      ec2.Port.tcp(5432),
+      'PostgreSQL access from RDS Proxy'
+    );
+
     // Create RDS subnet group for isolated subnets
     const subnetGroup = new rds.SubnetGroup(this, 'DatabaseSubnetGroup', {
       vpc: this.vpc,
@@ -128,6 +149,25 @@ export class ProductionDatabaseStack extends cdk.Stack {
         : cdk.RemovalPolicy.DESTROY,
     });
 
+    // RDS Proxy keeps warm backend connections so Lambda cold starts only pay a short TLS session setup
+    this.databaseProxy = this.database.addProxy('DatabaseProxy', {
+      secrets: [this.databaseSecret],
+      vpc: this.vpc,
+      vpcSubnets: {
+        subnetType: ec2.SubnetType.PRIVATE_WITH_EGRESS,
+      },
+      securityGroups: [this.proxySecurityGroup],
+      requireTLS: true,
+      // Leave headroom on the instance for admin and monitoring sessions that connect to it directly;
+      // migrations run through the proxy (DB_PROXY_ENDPOINT) and share its pool
+      maxConnectionsPercent: 90,
+      maxIdleConnectionsPercent: 50,
+      // Give up waiting for a backend well inside API Gateway's 29s integration timeout
+      borrowTimeout: cdk.Duration.seconds(10),
+      // Lambda containers are frozen between invocations; drop their idle client connections after 15 minutes
+      idleClientTimeout: cdk.Duration.minutes(15),
+    });
+
     // Outputs
     new cdk.CfnOutput(this, 'DatabaseEndpoint', {
       value: this.database.instanceEndpoint.hostname,
@@ -135,6 +175,12 @@ export class ProductionDatabaseStack extends cdk.Stack {
       exportName: `${appName}-${environment}-prod-db-endpoint`,
     });
 
+    new cdk.CfnOutput(this, 'DatabaseProxyEndpoint', {
+      value: this.databaseProxy.endpoint,
+      description: 'RDS Proxy endpoint used by Lambda functions',
+      exportName: `${appName}-${environment}-prod-db-proxy-endpoint`,
+    });
+
     new cdk.CfnOutput(this, 'DatabasePort', {
       value: this.database.instanceEndpoint.port.toString(),
       description: 'RDS PostgreSQL port',
@@ -26,6 +26,9 @@ mkdir -p temp-package
 # Copy compiled JavaScript files to root level
 cp dist/*.js temp-package/
 
+# Copy migration SQL files read by the migration handler
+cp -r dist/migrations temp-package/
+
 # Copy node_modules (production dependencies only)
 cp -r node_modules temp-package/
 